@@ -1,12 +1,81 @@
 from datetime import datetime
 import logging
-from typing import Dict
-from models import SecurityMetrics, SecurityChange, ChangeType
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from models import SecurityMetrics, SecurityChange, ChangeType, TradeType
+from turnover_analysis import TurnoverTracker
+from data_validation import ISIN_PATTERN
+from data_loading import CONCENTRATION_METRICS
+
+ATTRIBUTION_EFFECTS = [
+    "value_change",
+    "quantity_effect",
+    "price_effect",
+    "interaction_effect",
+    "unattributed",
+]
+
+TRADE_SUMMARY_KEYS = {
+    TradeType.NEW_ENTRY: "new_entries",
+    TradeType.EXIT: "exits",
+    TradeType.BUY: "buys",
+    TradeType.SELL: "sells",
+    TradeType.HOLD: "holds",
+}
 
 
 class DataAnalyzer:
     def __init__(self, portfolio_data: Dict):
         self.portfolio_data = portfolio_data
+        self._frames: Dict[str, tuple] = {}
+        self._turnover_trackers: Dict[tuple, tuple] = {}
+
+    def _holdings_frame(self, month: str) -> pd.DataFrame:
+        """Return a month's holdings as a frame indexed by ISIN, cached per month"""
+        month_data = self.portfolio_data[month]
+        cached = self._frames.get(month)
+        if cached and cached[0] is month_data:
+            return cached[1]
+
+        securities = month_data["securities"]
+        frame = pd.DataFrame(
+            [security["metrics"] for security in securities.values()],
+            index=pd.Index(list(securities.keys()), name="isin"),
+            columns=["quantity", "market_value", "nav_percentage", "industry"],
+        )
+        frame["name"] = [security["name"] for security in securities.values()]
+        self._frames[month] = (month_data, frame)
+        return frame
+
+    def _all_months(self) -> List[str]:
+        """Return all loaded months in chronological order"""
+        return sorted(
+            self.portfolio_data.keys(), key=lambda x: datetime.strptime(x, "%B %Y")
+        )
+
+    def _valid_holdings(self, month: str) -> pd.DataFrame:
+        """Holdings with a well-formed ISIN and a finite market value"""
+        frame = self._holdings_frame(month)
+        valid = frame.index.to_series().astype(str).str.fullmatch(
+            ISIN_PATTERN
+        ) & np.isfinite(frame["market_value"].astype(float))
+        return frame[valid]
+
+    def _sorted_months(self, start_month: str, end_month: str) -> List[str]:
+        """Return the chronologically ordered months from start to end inclusive"""
+        all_months = self._all_months()
+
+        if start_month not in all_months or end_month not in all_months:
+            raise ValueError("Invalid months selected.")
+
+        start_index = all_months.index(start_month)
+        end_index = all_months.index(end_month)
+
+        if start_index >= end_index:
+            raise ValueError("Start month must precede end month.")
+
+        return all_months[start_index : end_index + 1]
 
     def analyze_changes(self, start_month: str, end_month: str) -> Dict:
         try:
@@ -108,20 +177,7 @@ class DataAnalyzer:
 
     def analyze_changes_over_range(self, start_month: str, end_month: str) -> Dict:
         try:
-            all_months = sorted(
-                self.portfolio_data.keys(), key=lambda x: datetime.strptime(x, "%B %Y")
-            )
-
-            if start_month not in all_months or end_month not in all_months:
-                raise ValueError("Invalid months selected.")
-
-            start_index = all_months.index(start_month)
-            end_index = all_months.index(end_month)
-
-            if start_index >= end_index:
-                raise ValueError("Start month must precede end month.")
-
-            selected_months = all_months[start_index : end_index + 1]
+            selected_months = self._sorted_months(start_month, end_month)
 
             range_analysis = {
                 "metadata": {
@@ -138,6 +194,7 @@ class DataAnalyzer:
                     "no_change": 0,
                     "total_value_change": 0,
                 },
+                "concentration": self._concentration_series(selected_months),
             }
 
             for i in range(len(selected_months) - 1):
@@ -164,3 +221,330 @@ class DataAnalyzer:
         except Exception as e:
             logging.error(f"Error analyzing changes over range: {e}")
             return None
+
+    def _concentration_series(self, months: List[str]) -> List[Dict]:
+        """Read the concentration metrics stored in each month's metadata"""
+        return [
+            {
+                "month": month,
+                **{
+                    metric: self.portfolio_data[month]["metadata"].get(metric)
+                    for metric in CONCENTRATION_METRICS
+                },
+            }
+            for month in months
+        ]
+
+    def analyze_concentration_over_range(
+        self, start_month: str, end_month: str
+    ) -> Dict:
+        """Concentration metrics per month, as precomputed at ingest"""
+        try:
+            selected_months = self._sorted_months(start_month, end_month)
+            return {
+                "metadata": {
+                    "start_month": start_month,
+                    "end_month": end_month,
+                    "analysis_date": datetime.now().isoformat(),
+                },
+                "concentration": self._concentration_series(selected_months),
+            }
+
+        except Exception as e:
+            logging.error(f"Error analyzing concentration over range: {e}")
+            return None
+
+    def compare_months(self, months: List[str] = None, baseline: str = None) -> Dict:
+        """Compare every pair of months in one pass over aligned holdings.
+
+        Matrices are indexed [from_month][to_month]. If a baseline month is
+        given, its row is also returned as "baseline", comparing it to each
+        month.
+        """
+        try:
+            all_months = self._all_months()
+            if months is None:
+                months = all_months
+            else:
+                if any(month not in self.portfolio_data for month in months):
+                    raise ValueError("Invalid months selected.")
+                months = [month for month in all_months if month in months]
+            if not months:
+                raise ValueError("No months selected.")
+            if baseline is not None and baseline not in months:
+                raise ValueError("Baseline month must be one of the selected months.")
+
+            # Align every month on the union of ISINs once
+            frames = [self._holdings_frame(month) for month in months]
+            isins = pd.Index(
+                np.unique(np.concatenate([frame.index.to_numpy() for frame in frames]))
+            )
+            held = np.stack([isins.isin(frame.index) for frame in frames])
+            weights = np.stack(
+                [
+                    frame["nav_percentage"].reindex(isins).fillna(0).to_numpy(float)
+                    for frame in frames
+                ]
+            )
+            counts = held.sum(axis=1)
+
+            shared = held.astype(np.int64) @ held.T.astype(np.int64)
+            union = counts[:, None] + counts[None, :] - shared
+            with np.errstate(divide="ignore", invalid="ignore"):
+                jaccard = np.where(union > 0, shared / union, 1.0)
+            weight_overlap = np.stack(
+                [
+                    np.minimum(weights[row], weights).sum(axis=1)
+                    for row in range(len(months))
+                ]
+            )
+            total_values = np.array(
+                [
+                    self.portfolio_data[month]["metadata"]["total_value"]
+                    for month in months
+                ]
+            )
+
+            matrices = {
+                "shared_holdings": shared,
+                "jaccard": jaccard,
+                "weight_overlap": weight_overlap,
+                "value_change": total_values[None, :] - total_values[:, None],
+                "new_entries": counts[None, :] - shared,
+                "exits": counts[:, None] - shared,
+            }
+
+            comparison = {
+                "metadata": {
+                    "months": months,
+                    "baseline": baseline,
+                    "analysis_date": datetime.now().isoformat(),
+                },
+                "matrices": {
+                    name: pd.DataFrame(matrix, index=months, columns=months).to_dict(
+                        orient="index"
+                    )
+                    for name, matrix in matrices.items()
+                },
+            }
+            if baseline is not None:
+                comparison["baseline"] = {
+                    name: matrix[baseline]
+                    for name, matrix in comparison["matrices"].items()
+                }
+            return comparison
+
+        except Exception as e:
+            logging.error(f"Error comparing months: {e}")
+            return None
+
+    def analyze_attribution(self, start_month: str, end_month: str) -> Dict:
+        """Split each security's value change into quantity, price and interaction effects.
+
+        With price = market_value / quantity, the change decomposes exactly as
+        old_price * dQ + old_quantity * dP + dQ * dP. New entries and exits
+        take the price from the month they are held in, so their whole value
+        change is a quantity effect. Rows with a market value but no usable
+        quantity have no price; they are flagged "unpriced" and their whole
+        change is reported as unattributed. Rows with a malformed ISIN or no
+        market value are left out.
+        """
+        try:
+            if (
+                start_month not in self.portfolio_data
+                or end_month not in self.portfolio_data
+            ):
+                raise ValueError("Invalid months selected")
+
+            start = self._valid_holdings(start_month)
+            end = self._valid_holdings(end_month)
+            isins = start.index.union(end.index)
+            held_start = isins.isin(start.index)
+            held_end = isins.isin(end.index)
+            start = start.reindex(isins)
+            end = end.reindex(isins)
+
+            unpriced = (held_start & ~(start["quantity"].fillna(0) != 0).to_numpy()) | (
+                held_end & ~(end["quantity"].fillna(0) != 0).to_numpy()
+            )
+            old_qty = start["quantity"].fillna(0).to_numpy(dtype=float)
+            new_qty = end["quantity"].fillna(0).to_numpy(dtype=float)
+            old_value = start["market_value"].fillna(0).to_numpy(dtype=float)
+            new_value = end["market_value"].fillna(0).to_numpy(dtype=float)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                old_price = np.where(old_qty != 0, old_value / old_qty, np.nan)
+                new_price = np.where(new_qty != 0, new_value / new_qty, np.nan)
+            old_price = np.where(np.isnan(old_price), new_price, old_price)
+            new_price = np.where(np.isnan(new_price), old_price, new_price)
+            old_price = np.nan_to_num(old_price)
+            new_price = np.nan_to_num(new_price)
+
+            qty_change = new_qty - old_qty
+            price_change = new_price - old_price
+            quantity_effect = np.where(unpriced, 0.0, old_price * qty_change)
+            price_effect = np.where(unpriced, 0.0, old_qty * price_change)
+            interaction_effect = np.where(unpriced, 0.0, qty_change * price_change)
+            value_change = new_value - old_value
+
+            trade_type = np.select(
+                [
+                    ~held_start,
+                    ~held_end,
+                    np.isclose(new_qty, old_qty),
+                    qty_change > 0,
+                ],
+                [
+                    TradeType.NEW_ENTRY.value,
+                    TradeType.EXIT.value,
+                    TradeType.HOLD.value,
+                    TradeType.BUY.value,
+                ],
+                default=TradeType.SELL.value,
+            )
+
+            attribution = pd.DataFrame(
+                {
+                    "name": end["name"].fillna(start["name"]),
+                    "industry": end["industry"].fillna(start["industry"]),
+                    "trade_type": trade_type,
+                    "quantity_change": qty_change,
+                    "value_change": value_change,
+                    "quantity_effect": quantity_effect,
+                    "price_effect": price_effect,
+                    "interaction_effect": interaction_effect,
+                    "unattributed": value_change
+                    - quantity_effect
+                    - price_effect
+                    - interaction_effect,
+                    "unpriced": unpriced,
+                },
+                index=isins,
+            )
+
+            trade_counts = attribution["trade_type"].value_counts()
+            summary = {
+                key: int(trade_counts.get(trade.value, 0))
+                for trade, key in TRADE_SUMMARY_KEYS.items()
+            }
+            summary["unpriced"] = int(unpriced.sum())
+            summary.update(
+                {
+                    effect: float(attribution[effect].sum())
+                    for effect in ATTRIBUTION_EFFECTS
+                }
+            )
+
+            return {
+                "metadata": {
+                    "start_month": start_month,
+                    "end_month": end_month,
+                    "analysis_date": datetime.now().isoformat(),
+                },
+                "summary": summary,
+                "by_industry": attribution.groupby("industry")[ATTRIBUTION_EFFECTS]
+                .sum()
+                .to_dict(orient="index"),
+                "attributions": attribution.to_dict(orient="index"),
+            }
+
+        except Exception as e:
+            logging.error(f"Error analyzing attribution: {e}")
+            return None
+
+    def analyze_attribution_over_range(self, start_month: str, end_month: str) -> Dict:
+        """Attribute value changes for each adjacent month pair and roll them up"""
+        try:
+            selected_months = self._sorted_months(start_month, end_month)
+
+            range_attribution = {
+                "metadata": {
+                    "start_month": start_month,
+                    "end_month": end_month,
+                    "analysis_date": datetime.now().isoformat(),
+                },
+                "monthly_attributions": [],
+                "summary": {},
+                "by_industry": {},
+            }
+
+            industry_totals = []
+            for month1, month2 in zip(selected_months, selected_months[1:]):
+                month_attribution = self.analyze_attribution(month1, month2)
+
+                if month_attribution:
+                    range_attribution["monthly_attributions"].append(month_attribution)
+                    for key, value in month_attribution["summary"].items():
+                        range_attribution["summary"][key] = (
+                            range_attribution["summary"].get(key, 0) + value
+                        )
+                    industry_totals.append(
+                        pd.DataFrame.from_dict(
+                            month_attribution["by_industry"], orient="index"
+                        )
+                    )
+
+            if industry_totals:
+                range_attribution["by_industry"] = (
+                    pd.concat(industry_totals)
+                    .groupby(level=0)
+                    .sum()
+                    .to_dict(orient="index")
+                )
+
+            return range_attribution
+
+        except Exception as e:
+            logging.error(f"Error analyzing attribution over range: {e}")
+            return None
+
+    def analyze_turnover(
+        self, start_month: str, end_month: str, window: int = 12
+    ) -> Dict:
+        """Rolling turnover, name churn and holding-period statistics over a range.
+
+        Trackers are kept per start month and window, so extending the end
+        month only appends the months that were not seen before.
+        """
+        try:
+            selected_months = self._sorted_months(start_month, end_month)
+
+            # Rebuild if the range no longer extends the tracked months or any
+            # tracked month has been re-imported since it was appended
+            key = (start_month, window)
+            tracker, sources = self._turnover_trackers.get(key, (None, []))
+            if (
+                tracker is None
+                or tracker.months != selected_months[: len(tracker.months)]
+                or any(
+                    source is not self.portfolio_data[month]
+                    for month, source in zip(tracker.months, sources)
+                )
+            ):
+                tracker, sources = TurnoverTracker(window), []
+                self._turnover_trackers[key] = (tracker, sources)
+            for month in selected_months[len(tracker.months) :]:
+                tracker.append_month(month, self._holdings_frame(month))
+                sources.append(self.portfolio_data[month])
+
+            monthly = list(tracker.results)
+            return {
+                "metadata": {
+                    "start_month": start_month,
+                    "end_month": end_month,
+                    "window": window,
+                    "analysis_date": datetime.now().isoformat(),
+                },
+                "monthly_turnover": monthly,
+                "summary": {
+                    "rolling_turnover": monthly[-1]["rolling_turnover"],
+                    "rolling_name_churn": monthly[-1]["rolling_name_churn"],
+                    "average_holding_months": tracker.average_holding_months(),
+                },
+                "holding_periods": tracker.holding_periods(),
+                "survival_curve": tracker.survival_curve(),
+            }
+
+        except Exception as e:
+            logging.error(f"Error analyzing turnover: {e}")
+            return None
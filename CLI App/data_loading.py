@@ -1,12 +1,23 @@
 import json
+import os
+from dataclasses import asdict
 from pathlib import Path
 import pandas as pd
 import logging
 from datetime import datetime
-from data_validation import DataValidator
+from data_validation import DataValidator, REJECTING_CHECKS
 from models import SecurityMetrics
 from typing import Dict
 
+CONCENTRATION_METRICS = [
+    "herfindahl_index",
+    "effective_holdings",
+    "top_10_weight",
+    "top_25_weight",
+    "largest_industry",
+    "largest_industry_weight",
+]
+
 
 class PortfolioAnalyzer:
 
@@ -14,6 +25,7 @@ class PortfolioAnalyzer:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         self.validator = DataValidator()
+        self.validation_reports: Dict[str, pd.DataFrame] = {}
         self.portfolio_data: Dict[str, Dict] = self._load_all_data()
 
     def _load_all_data(self) -> Dict:
@@ -25,10 +37,59 @@ class PortfolioAnalyzer:
                     month_data = json.load(f)
                     month = file.stem
                     data[month] = month_data
+
+                # Backfill data stored before concentration metrics existed
+                if "herfindahl_index" not in month_data["metadata"]:
+                    month_data["metadata"].update(
+                        self._concentration_from_securities(month_data["securities"])
+                    )
+                    # Write to a temp file first so a failed dump cannot truncate the month
+                    temp_file = file.with_suffix(".json.tmp")
+                    with open(temp_file, "w") as f:
+                        json.dump(month_data, f, indent=2)
+                    os.replace(temp_file, file)
             except Exception as e:
                 logging.error(f"Error loading {file}: {e}")
         return data
 
+    @staticmethod
+    def _concentration_metrics(nav: pd.Series, industry: pd.Series) -> Dict:
+        """Concentration of a month's holdings from their NAV percentages.
+
+        All metrics use the same basis: weights are normalised to the total of
+        the ISIN rows, so cash and other assets outside them are excluded.
+        The top-N and industry weights are percentages of that total.
+        """
+        valid = nav.notna() & (nav > 0)
+        nav = nav[valid]
+        industry = industry[valid]
+        if nav.empty:
+            return {
+                **dict.fromkeys(CONCENTRATION_METRICS, 0.0),
+                "largest_industry": None,
+            }
+
+        weights = nav / nav.sum()
+        herfindahl = float((weights**2).sum())
+        ranked = weights.sort_values(ascending=False) * 100
+        industry_weights = weights.groupby(industry).sum() * 100
+        return {
+            "herfindahl_index": herfindahl,
+            "effective_holdings": 1 / herfindahl,
+            "top_10_weight": float(ranked.iloc[:10].sum()),
+            "top_25_weight": float(ranked.iloc[:25].sum()),
+            "largest_industry": str(industry_weights.idxmax()),
+            "largest_industry_weight": float(industry_weights.max()),
+        }
+
+    def _concentration_from_securities(self, securities: Dict) -> Dict:
+        """Backfill concentration metrics for data stored before they were computed"""
+        metrics = [security["metrics"] for security in securities.values()]
+        return self._concentration_metrics(
+            pd.Series([m["nav_percentage"] for m in metrics], dtype=float),
+            pd.Series([m["industry"] for m in metrics], dtype=object),
+        )
+
     def process_excel(self, file_path: str, month_year: str) -> bool:
         """Process an Excel file and store the data"""
 
@@ -65,12 +126,31 @@ class PortfolioAnalyzer:
                 pd.to_numeric(portfolio_data["NAV"], errors="coerce") * 100
             )  # Convert to percentage
 
+            # Validate all rows at once and keep the per-row report
+            validation_report = self.validator.validate_holdings(portfolio_data)
+            self.validation_reports[month_year] = validation_report
+            if not validation_report.empty:
+                counts = validation_report["check"].value_counts().to_dict()
+                logging.warning(f"Validation issues in {month_year}: {counts}")
+
+            # Drop rows that cannot be stored as holdings; they stay in the report
+            rejected = validation_report.loc[
+                validation_report["check"].isin(REJECTING_CHECKS), "row"
+            ].unique()
+            portfolio_data = portfolio_data.drop(index=rejected)
+
             # Create structured data
             processed_data = {
                 "metadata": {
                     "date": month_year,
                     "total_securities": len(portfolio_data),
                     "total_value": float(portfolio_data["MarketValue"].sum()),
+                    "validation_errors": len(validation_report),
+                    "rejected_rows": len(rejected),
+                    **self._concentration_metrics(
+                        portfolio_data["NAV"],
+                        portfolio_data["Industry"].astype(str).str.strip(),
+                    ),
                     "processing_date": datetime.now().isoformat(),
                 },
                 "securities": {},
@@ -1,5 +1,24 @@
 from datetime import datetime
 import os
+import numpy as np
+import pandas as pd
+
+ISIN_PATTERN = r"[A-Z]{2}[A-Z0-9]{9}[0-9]"
+NAV_ROW_TOLERANCE = 0.05  # percentage points
+NAV_SUM_RANGE = (90.0, 101.0)  # percent; cash and TREPS sit outside the ISIN rows
+VALIDATION_COLUMNS = ["row", "isin", "check", "message"]
+
+# Checks that make a row unusable as a holding; rows failing them are not stored
+REJECTING_CHECKS = [
+    "isin_format",
+    "duplicate_isin",
+    "quantity_missing",
+    "market_value_missing",
+    "nav_missing",
+]
+
+# Luhn contribution of a digit when it sits in a doubled position
+_LUHN_DOUBLED = np.array([0, 2, 4, 6, 8, 1, 3, 5, 7, 9])
 
 
 class DataValidator:
@@ -22,3 +41,117 @@ class DataValidator:
             return True
         except (ValueError, TypeError):
             return False
+
+    @staticmethod
+    def validate_isin_checksums(isins: pd.Series) -> pd.Series:
+        """Check ISIN check digits for a series of well-formed 12 character ISINs"""
+        if isins.empty:
+            return pd.Series(dtype=bool, index=isins.index)
+
+        chars = (
+            np.array(isins.tolist(), dtype="S12").view(np.uint8).reshape(-1, 12)
+        ).astype(np.int64)
+        is_digit = chars < ord("A")
+        values = np.where(is_digit, chars - ord("0"), chars - ord("A") + 10)
+
+        # Letters expand to two digits, so each character's distance from the
+        # check digit depends on how many digits the characters after it produce
+        body = values[:, :11]
+        widths = np.where(is_digit[:, :11], 1, 2)
+        offsets = np.cumsum(widths[:, ::-1], axis=1)[:, ::-1] - widths + 1
+
+        def luhn(digits: np.ndarray, positions: np.ndarray) -> np.ndarray:
+            return np.where(positions % 2 == 1, _LUHN_DOUBLED[digits], digits)
+
+        units = luhn(body % 10, offsets)
+        tens = np.where(body >= 10, luhn(body // 10, offsets + 1), 0)
+        total = units.sum(axis=1) + tens.sum(axis=1) + values[:, 11]
+        return pd.Series(total % 10 == 0, index=isins.index)
+
+    @staticmethod
+    def validate_holdings(portfolio_data: pd.DataFrame) -> pd.DataFrame:
+        """Validate a parsed holdings frame column-wise and return one row per error.
+
+        Expects the numeric columns to be already coerced, so values that failed
+        conversion show up as missing. NAV is expected in percent.
+        """
+        errors = []
+
+        def flag(mask: pd.Series, check: str, message: str):
+            if mask.any():
+                flagged = portfolio_data.loc[mask]
+                errors.append(
+                    pd.DataFrame(
+                        {
+                            "row": flagged.index,
+                            "isin": flagged["ISIN"].astype(str).values,
+                            "check": check,
+                            "message": message,
+                        }
+                    )
+                )
+
+        isins = portfolio_data["ISIN"].astype(str).str.strip()
+        well_formed = isins.str.fullmatch(ISIN_PATTERN)
+        flag(
+            ~well_formed,
+            "isin_format",
+            "ISIN is not 12 characters of the form AA000000000D",
+        )
+        checksum_ok = DataValidator.validate_isin_checksums(isins[well_formed])
+        flag(
+            ~checksum_ok.reindex(isins.index, fill_value=True).astype(bool),
+            "isin_checksum",
+            "ISIN check digit does not match",
+        )
+        flag(
+            isins.duplicated(keep=False),
+            "duplicate_isin",
+            "ISIN appears more than once",
+        )
+
+        for column, check, label in [
+            ("Quantity", "quantity", "Quantity"),
+            ("MarketValue", "market_value", "Market value"),
+            ("NAV", "nav", "NAV percentage"),
+        ]:
+            values = portfolio_data[column]
+            flag(
+                values.isna(), f"{check}_missing", f"{label} is missing or not numeric"
+            )
+            flag(values < 0, f"{check}_negative", f"{label} is negative")
+
+        # Every row should carry the same value-to-NAV ratio, namely the fund's net
+        # assets. Estimate it from rows where both values are present so that one
+        # missing value cannot skew it and flag unrelated rows.
+        market_value = portfolio_data["MarketValue"]
+        nav = portfolio_data["NAV"]
+        nav_total = nav.sum()
+        comparable = (market_value > 0) & (nav > 0)
+        if comparable.any():
+            net_assets = (market_value[comparable] / nav[comparable]).median() * 100
+            expected_nav = market_value / net_assets * 100
+            flag(
+                comparable & ((nav - expected_nav).abs() > NAV_ROW_TOLERANCE),
+                "nav_inconsistent",
+                "NAV percentage does not match market value share of net assets",
+            )
+
+        if not NAV_SUM_RANGE[0] <= nav_total <= NAV_SUM_RANGE[1]:
+            errors.append(
+                pd.DataFrame(
+                    {
+                        "row": [None],
+                        "isin": [None],
+                        "check": "nav_sum",
+                        "message": (
+                            f"NAV percentages sum to {nav_total:.2f}%, expected "
+                            f"{NAV_SUM_RANGE[0]:.0f}-{NAV_SUM_RANGE[1]:.0f}%"
+                        ),
+                    }
+                )
+            )
+
+        if not errors:
+            return pd.DataFrame(columns=VALIDATION_COLUMNS)
+        return pd.concat(errors, ignore_index=True)[VALIDATION_COLUMNS]
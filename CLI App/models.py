@@ -26,3 +26,11 @@ class SecurityChange:
     new_metrics: Optional[SecurityMetrics]
     percentage_change: float
     value_change: float
+
+
+class TradeType(Enum):
+    NEW_ENTRY = "NEW_ENTRY"
+    EXIT = "EXIT"
+    BUY = "BUY"
+    SELL = "SELL"
+    HOLD = "HOLD"
@@ -1,4 +1,5 @@
 import logging
+import altair as alt
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
@@ -10,11 +11,29 @@ from pathlib import Path
 save_dir = Path("..\data\output_charts")
 save_dir.mkdir(parents=True, exist_ok=True)
 
+CHART_FORMATS = ("png", "spec")
+
+CHANGE_TYPE_LABELS = {
+    "new_entries": "New Entries",
+    "exits": "Exits",
+    "increases": "Increases",
+    "decreases": "Decreases",
+    "no_change": "No Change",
+}
+
 
 class ReportGenerator:
 
-    def generate_reports(self, analysis: Dict, is_range: bool = False) -> list:
-        """Generate detailed reports and visualizations."""
+    def generate_reports(
+        self, analysis: Dict, is_range: bool = False, chart_format: str = "png"
+    ) -> list:
+        """Generate detailed reports and visualizations.
+
+        With chart_format="png" charts are rendered to files and their paths
+        returned. With chart_format="spec" Altair chart specs are returned
+        instead, for the browser to draw.
+        """
+        self._check_chart_format(chart_format)
         try:
             print("\n=== Portfolio Analysis Report ===")
             if is_range:
@@ -36,6 +55,10 @@ class ReportGenerator:
             )
 
             # Generate visualizations
+            if chart_format == "spec":
+                if is_range:
+                    return self._generate_range_chart_specs(analysis)
+                return [self._summary_barchart_spec(analysis)]
             if is_range:
                 chart_file_paths = []
                 chart_file_paths += self._generate_range_charts(analysis)
@@ -47,6 +70,14 @@ class ReportGenerator:
             logging.error(f"Error generating reports: {e}")
             return []
 
+    @staticmethod
+    def _check_chart_format(chart_format: str):
+        if chart_format not in CHART_FORMATS:
+            raise ValueError(
+                f"Unsupported chart format: {chart_format}. "
+                f"Expected one of {', '.join(CHART_FORMATS)}."
+            )
+
     def _generate_range_charts(self, analysis: Dict) -> list:
         """Generate charts for a multi-month range."""
         chart_file_paths = []
@@ -54,6 +85,8 @@ class ReportGenerator:
         chart_file_paths.append(self._generate_portfolio_value_linechart(analysis))
         chart_file_paths.append(self._generate_correlation_heatmap(analysis))
         chart_file_paths.append(self._generate_stacked_area_chart(analysis))
+        if analysis.get("concentration"):
+            chart_file_paths.append(self._generate_concentration_linechart(analysis))
         return chart_file_paths
 
     # Bar Chart: Monthly Summary of Change Types
@@ -208,3 +241,332 @@ class ReportGenerator:
 
         logging.info(f"Stacked area chart saved to {chart_file}")
         return str(chart_file_path)
+
+    def _generate_concentration_linechart(self, analysis: Dict) -> str:
+        """Generate a line chart of portfolio concentration over time."""
+        months = [month["month"] for month in analysis["concentration"]]
+        top_10 = [month["top_10_weight"] for month in analysis["concentration"]]
+        top_25 = [month["top_25_weight"] for month in analysis["concentration"]]
+        largest_industry = [
+            month["largest_industry_weight"] for month in analysis["concentration"]
+        ]
+        effective_holdings = [
+            month["effective_holdings"] for month in analysis["concentration"]
+        ]
+
+        fig, ax1 = plt.subplots(figsize=(12, 6))
+        ax1.plot(months, top_10, marker="o", label="Top 10 Weight")
+        ax1.plot(months, top_25, marker="o", label="Top 25 Weight")
+        ax1.plot(months, largest_industry, marker="o", label="Largest Industry Weight")
+        ax1.set_xlabel("Months")
+        ax1.set_ylabel("Weight (% of Holdings)")
+        ax1.tick_params(axis="x", rotation=45)
+
+        ax2 = ax1.twinx()
+        ax2.plot(
+            months,
+            effective_holdings,
+            marker="s",
+            linestyle="--",
+            color="k",
+            label="Effective Holdings",
+        )
+        ax2.set_ylabel("Effective Number of Holdings")
+
+        lines1, labels1 = ax1.get_legend_handles_labels()
+        lines2, labels2 = ax2.get_legend_handles_labels()
+        ax1.legend(lines1 + lines2, labels1 + labels2, loc="upper left")
+        plt.title("Portfolio Concentration Over Time")
+        plt.tight_layout()
+
+        chart_file = (
+            f"concentration_linechart_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        )
+        chart_file_path = save_dir / chart_file
+        plt.savefig(chart_file_path)
+        plt.close(fig)
+
+        logging.info(f"Concentration line chart saved to {chart_file}")
+        return str(chart_file_path)
+
+    def generate_comparison_report(
+        self, comparison: Dict, metric: str = "jaccard", chart_format: str = "png"
+    ) -> list:
+        """Print a baseline comparison and draw a month-by-month heatmap."""
+        self._check_chart_format(chart_format)
+        try:
+            print("\n=== Month Comparison Report ===")
+            baseline = comparison["metadata"]["baseline"]
+            if baseline:
+                print(f"Baseline: {baseline}")
+                for month, value in comparison["baseline"][metric].items():
+                    print(f"{month}: {value:,.2f}")
+            if chart_format == "spec":
+                return [self._comparison_heatmap_spec(comparison, metric)]
+            return [self._generate_comparison_heatmap(comparison, metric)]
+
+        except Exception as e:
+            logging.error(f"Error generating comparison report: {e}")
+            return []
+
+    def _generate_comparison_heatmap(self, comparison: Dict, metric: str) -> str:
+        """Generate a heatmap of one comparison metric across all month pairs."""
+        matrix = pd.DataFrame.from_dict(comparison["matrices"][metric], orient="index")
+
+        plt.figure(figsize=(10, 8))
+        sns.heatmap(
+            matrix,
+            annot=len(matrix) <= 12,
+            cmap="viridis",
+            fmt=".2f",
+            linewidths=0.5,
+        )
+        plt.title(f"Month Comparison: {metric.replace('_', ' ').title()}")
+        plt.xlabel("To Month")
+        plt.ylabel("From Month")
+        plt.tight_layout()
+
+        chart_file = f"comparison_heatmap_{metric}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        chart_file_path = save_dir / chart_file
+        plt.savefig(chart_file_path)
+        plt.close()
+
+        logging.info(f"Comparison heatmap saved to {chart_file}")
+        return str(chart_file_path)
+
+    # Chart specs: declarative Altair charts drawn client-side
+
+    def _generate_range_chart_specs(self, analysis: Dict) -> list:
+        """Generate chart specs for a multi-month range."""
+        change_types = self._change_type_frame(analysis)
+        chart_specs = [
+            self._change_type_barchart_spec(change_types),
+            self._portfolio_value_linechart_spec(analysis),
+            self._correlation_heatmap_spec(analysis),
+            self._stacked_area_chart_spec(change_types),
+        ]
+        if analysis.get("concentration"):
+            chart_specs.append(self._concentration_linechart_spec(analysis))
+        return chart_specs
+
+    def _summary_barchart_spec(self, analysis: Dict) -> alt.Chart:
+        """Bar chart spec of change type counts for a single month pair."""
+        counts = pd.DataFrame(
+            {
+                "Change Type": list(CHANGE_TYPE_LABELS.values()),
+                "Count": [
+                    analysis["summary"][change_type]
+                    for change_type in CHANGE_TYPE_LABELS
+                ],
+            }
+        )
+        period = (
+            f"{analysis['metadata']['start_month']} to "
+            f"{analysis['metadata']['end_month']}"
+        )
+        return (
+            alt.Chart(counts, title=f"Change Types: {period}")
+            .mark_bar()
+            .encode(
+                x=alt.X("Change Type:N", sort=list(CHANGE_TYPE_LABELS.values())),
+                y="Count:Q",
+                color=alt.Color(
+                    "Change Type:N", sort=list(CHANGE_TYPE_LABELS.values())
+                ),
+                tooltip=["Change Type", "Count"],
+            )
+        )
+
+    def _change_type_frame(self, analysis: Dict) -> pd.DataFrame:
+        """Change type counts per month in long format."""
+        return pd.DataFrame(
+            [
+                {
+                    "Month": month["metadata"]["end_month"],
+                    "Change Type": label,
+                    "Count": month["summary"][change_type],
+                }
+                for month in analysis["monthly_changes"]
+                for change_type, label in CHANGE_TYPE_LABELS.items()
+            ]
+        )
+
+    def _month_order(self, frame: pd.DataFrame) -> list:
+        """Months in the order they first appear, to keep charts chronological."""
+        return list(dict.fromkeys(frame["Month"]))
+
+    def _change_type_barchart_spec(self, change_types: pd.DataFrame) -> alt.Chart:
+        """Grouped bar chart spec for monthly change type summary."""
+        return (
+            alt.Chart(change_types, title="Monthly Summary of Change Types")
+            .mark_bar()
+            .encode(
+                x=alt.X("Month:N", sort=self._month_order(change_types)),
+                xOffset=alt.XOffset(
+                    "Change Type:N", sort=list(CHANGE_TYPE_LABELS.values())
+                ),
+                y="Count:Q",
+                color=alt.Color(
+                    "Change Type:N", sort=list(CHANGE_TYPE_LABELS.values())
+                ),
+                tooltip=["Month", "Change Type", "Count"],
+            )
+        )
+
+    def _portfolio_value_linechart_spec(self, analysis: Dict) -> alt.Chart:
+        """Line chart spec for portfolio value change over time."""
+        values = pd.DataFrame(
+            {
+                "Month": [
+                    month["metadata"]["end_month"]
+                    for month in analysis["monthly_changes"]
+                ],
+                "Value Change (Lakhs)": [
+                    month["summary"]["total_value_change"]
+                    for month in analysis["monthly_changes"]
+                ],
+            }
+        )
+        return (
+            alt.Chart(values, title="Total Portfolio Value Over Time")
+            .mark_line(point=True)
+            .encode(
+                x=alt.X("Month:N", sort=self._month_order(values)),
+                y="Value Change (Lakhs):Q",
+                tooltip=["Month", "Value Change (Lakhs)"],
+            )
+        )
+
+    def _correlation_heatmap_spec(self, analysis: Dict) -> alt.Chart:
+        """Heatmap spec of correlations between monthly changes."""
+        counts = pd.DataFrame(
+            {
+                label: [
+                    month["summary"][change_type]
+                    for month in analysis["monthly_changes"]
+                ]
+                for change_type, label in CHANGE_TYPE_LABELS.items()
+            }
+        )
+        correlation = (
+            counts.corr()
+            .rename_axis("Change Type")
+            .reset_index()
+            .melt(
+                id_vars="Change Type", var_name="Compared To", value_name="Correlation"
+            )
+        )
+        return self._heatmap_spec(
+            correlation,
+            "Change Type",
+            "Compared To",
+            "Correlation",
+            "Correlation Between Monthly Change Types",
+            scheme="redblue",
+        )
+
+    def _stacked_area_chart_spec(self, change_types: pd.DataFrame) -> alt.Chart:
+        """Stacked area chart spec for change type contributions over time."""
+        return (
+            alt.Chart(change_types, title="Change Type Contribution Over Time")
+            .mark_area(opacity=0.8)
+            .encode(
+                x=alt.X("Month:N", sort=self._month_order(change_types)),
+                y=alt.Y("Count:Q", stack="zero"),
+                color=alt.Color(
+                    "Change Type:N", sort=list(CHANGE_TYPE_LABELS.values())
+                ),
+                tooltip=["Month", "Change Type", "Count"],
+            )
+        )
+
+    def _concentration_linechart_spec(self, analysis: Dict) -> alt.Chart:
+        """Line chart spec of portfolio concentration over time."""
+        concentration = pd.DataFrame(analysis["concentration"]).rename(
+            columns={
+                "month": "Month",
+                "top_10_weight": "Top 10 Weight",
+                "top_25_weight": "Top 25 Weight",
+                "largest_industry_weight": "Largest Industry Weight",
+            }
+        )
+        weights = concentration.melt(
+            id_vars="Month",
+            value_vars=["Top 10 Weight", "Top 25 Weight", "Largest Industry Weight"],
+            var_name="Metric",
+            value_name="Weight (% of Holdings)",
+        )
+        month_axis = alt.X("Month:N", sort=self._month_order(concentration))
+        weight_lines = (
+            alt.Chart(weights)
+            .mark_line(point=True)
+            .encode(
+                x=month_axis,
+                y="Weight (% of Holdings):Q",
+                color="Metric:N",
+                tooltip=["Month", "Metric", "Weight (% of Holdings)"],
+            )
+        )
+        effective_holdings = (
+            alt.Chart(
+                concentration.rename(
+                    columns={"effective_holdings": "Effective Holdings"}
+                )
+            )
+            .mark_line(point=alt.OverlayMarkDef(shape="square"), strokeDash=[6, 4])
+            .encode(
+                x=month_axis,
+                y=alt.Y("Effective Holdings:Q", title="Effective Number of Holdings"),
+                color=alt.value("black"),
+                tooltip=["Month", "Effective Holdings"],
+            )
+        )
+        return alt.layer(
+            weight_lines,
+            effective_holdings,
+            title="Portfolio Concentration Over Time",
+        ).resolve_scale(y="independent")
+
+    def _comparison_heatmap_spec(self, comparison: Dict, metric: str) -> alt.Chart:
+        """Heatmap spec of one comparison metric across all month pairs."""
+        months = comparison["metadata"]["months"]
+        values = pd.DataFrame(
+            [
+                {"From Month": from_month, "To Month": to_month, "Value": value}
+                for from_month, row in comparison["matrices"][metric].items()
+                for to_month, value in row.items()
+            ]
+        )
+        return self._heatmap_spec(
+            values,
+            "From Month",
+            "To Month",
+            "Value",
+            f"Month Comparison: {metric.replace('_', ' ').title()}",
+            order=months,
+        )
+
+    def _heatmap_spec(
+        self,
+        data: pd.DataFrame,
+        y: str,
+        x: str,
+        value: str,
+        title: str,
+        order: list = None,
+        scheme: str = "viridis",
+    ) -> alt.Chart:
+        """Annotated heatmap spec from long-format data."""
+        base = alt.Chart(data, title=title).encode(
+            x=alt.X(f"{x}:N", sort=order),
+            y=alt.Y(f"{y}:N", sort=order),
+        )
+        cells = base.mark_rect().encode(
+            color=alt.Color(f"{value}:Q", scale=alt.Scale(scheme=scheme)),
+            tooltip=[y, x, alt.Tooltip(f"{value}:Q", format=".2f")],
+        )
+        # Match the PNG heatmaps, which drop annotations above twelve months
+        if data[y].nunique() > 12:
+            return cells
+        labels = base.mark_text().encode(text=alt.Text(f"{value}:Q", format=".2f"))
+        return cells + labels
@@ -2,7 +2,6 @@ import streamlit as st
 from data_loading import PortfolioAnalyzer
 from data_analysis import DataAnalyzer
 from reporting import ReportGenerator
-from pathlib import Path
 
 # Initialize classes
 portfolio_analyzer = PortfolioAnalyzer()
@@ -112,32 +111,30 @@ elif option == "Generate Reports":
                     start_month, end_month
                 )
                 if analysis:
-                    chart_files = report_generator.generate_reports(
-                        analysis, is_range=True
+                    chart_specs = report_generator.generate_reports(
+                        analysis, is_range=True, chart_format="spec"
                     )
-                    st.success("Report generated for range.")
-                    st.subheader("Generated Report")
-                    for chart_file in chart_files:
-                        st.image(
-                            chart_file,
-                            caption=f"Chart: {Path(chart_file).stem}",
-                            use_column_width=True,
-                        )
+                    if chart_specs:
+                        st.success("Report generated for range.")
+                        st.subheader("Generated Report")
+                        for chart_spec in chart_specs:
+                            st.altair_chart(chart_spec, use_container_width=True)
+                    else:
+                        st.error("Unable to generate charts for the selected range.")
                 else:
                     st.error("Unable to generate report for the selected range.")
             else:
                 analysis = data_analyzer.analyze_changes(start_month, end_month)
                 if analysis:
-                    chart_files = report_generator.generate_reports(
-                        analysis, is_range=True
+                    chart_specs = report_generator.generate_reports(
+                        analysis, is_range=False, chart_format="spec"
                     )
-                    st.success("Report generated for the selected month.")
-                    st.subheader("Generated Report")
-                    for chart_file in chart_files:
-                        st.image(
-                            chart_file,
-                            caption=f"Chart: {Path(chart_file).stem}",
-                            use_column_width=True,
-                        )
+                    if chart_specs:
+                        st.success("Report generated for the selected month.")
+                        st.subheader("Generated Report")
+                        for chart_spec in chart_specs:
+                            st.altair_chart(chart_spec, use_container_width=True)
+                    else:
+                        st.error("Unable to generate charts for the selected month.")
                 else:
                     st.error("Unable to generate report for the selected month.")
@@ -0,0 +1,196 @@
+from collections import deque
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from data_validation import ISIN_PATTERN
+
+
+class TurnoverTracker:
+    """Rolling turnover, churn and holding-period metrics over a month series.
+
+    Months are appended in chronological order. Each append only compares the
+    new month against the previous one and updates running window sums, so it
+    costs O(securities) regardless of how long the history is.
+    """
+
+    def __init__(self, window: int = 12):
+        if window < 1:
+            raise ValueError("Window must be at least one month.")
+        self.window = window
+        self.months: List[str] = []
+        self.results: List[Dict] = []
+
+        self._previous: pd.DataFrame = None
+        self._spell_starts = pd.Series(dtype=int)  # ISIN -> index of entry month
+        self._completed_durations = np.zeros(0, dtype=int)  # histogram of months held
+        self._steps = deque()
+        self._totals = dict.fromkeys(
+            ["purchases", "sales", "aum", "names", "entries", "exits"], 0.0
+        )
+        self._totals.update(spell_months=0, spells=0)
+
+    def append_month(self, month: str, holdings: pd.DataFrame) -> Dict:
+        """Add a month of holdings (indexed by ISIN with quantity and market_value).
+
+        Rows with a malformed ISIN or a non-finite quantity or market value
+        are ignored.
+        """
+        index = len(self.months)
+        holdings = holdings[["quantity", "market_value"]].astype(float)
+        valid = holdings.index.to_series().astype(str).str.fullmatch(
+            ISIN_PATTERN
+        ) & np.isfinite(holdings).all(axis=1)
+        holdings = holdings[valid]
+
+        if self._previous is None:
+            # The first month only opens spells; there is no transition yet
+            self._spell_starts = pd.Series(index, index=holdings.index, dtype=int)
+            self._previous = holdings
+            self.months.append(month)
+            result = {
+                "month": month,
+                "turnover": 0.0,
+                "name_churn": 0.0,
+                "rolling_turnover": 0.0,
+                "rolling_name_churn": 0.0,
+                "rolling_avg_holding_months": None,
+                "entries": 0,
+                "exits": 0,
+                "securities": len(holdings),
+            }
+            self.results.append(result)
+            return result
+
+        previous = self._previous
+        entries = holdings.index.difference(previous.index)
+        exits = previous.index.difference(holdings.index)
+        purchases, sales = self._trade_values(previous, holdings)
+
+        # Close spells for exited ISINs and open spells for new ones
+        durations = index - self._spell_starts.loc[exits].to_numpy(dtype=int)
+        self._spell_starts = pd.concat(
+            [
+                self._spell_starts.drop(exits),
+                pd.Series(index, index=entries, dtype=int),
+            ]
+        )
+        if len(durations):
+            counts = np.bincount(durations)
+            size = max(len(counts), len(self._completed_durations))
+            self._completed_durations = np.pad(
+                self._completed_durations, (0, size - len(self._completed_durations))
+            ) + np.pad(counts, (0, size - len(counts)))
+
+        step = {
+            "purchases": purchases,
+            "sales": sales,
+            "aum": (
+                float(holdings["market_value"].sum())
+                + float(previous["market_value"].sum())
+            )
+            / 2,
+            "names": (len(holdings) + len(previous)) / 2,
+            "entries": float(len(entries)),
+            "exits": float(len(exits)),
+            "spell_months": int(durations.sum()),
+            "spells": len(durations),
+        }
+        self._push_step(step)
+        self._previous = holdings
+        self.months.append(month)
+
+        totals = self._totals
+        steps = len(self._steps)
+        result = {
+            "month": month,
+            "turnover": min(purchases, sales) / step["aum"] if step["aum"] else 0.0,
+            "name_churn": (
+                (step["entries"] + step["exits"]) / 2 / step["names"]
+                if step["names"]
+                else 0.0
+            ),
+            "rolling_turnover": (
+                min(totals["purchases"], totals["sales"]) / (totals["aum"] / steps)
+                if totals["aum"]
+                else 0.0
+            ),
+            "rolling_name_churn": (
+                (totals["entries"] + totals["exits"]) / 2 / (totals["names"] / steps)
+                if totals["names"]
+                else 0.0
+            ),
+            "rolling_avg_holding_months": (
+                totals["spell_months"] / totals["spells"] if totals["spells"] else None
+            ),
+            "entries": len(entries),
+            "exits": len(exits),
+            "securities": len(holdings),
+        }
+        self.results.append(result)
+        return result
+
+    def _push_step(self, step: Dict):
+        """Add a step to the window and drop the oldest one once it is full"""
+        self._steps.append(step)
+        for key, value in step.items():
+            self._totals[key] += value
+        if len(self._steps) > self.window:
+            expired = self._steps.popleft()
+            for key, value in expired.items():
+                self._totals[key] -= value
+
+    @staticmethod
+    def _trade_values(previous: pd.DataFrame, current: pd.DataFrame) -> tuple:
+        """Value bought and sold between two months, at the latest known price"""
+        isins = previous.index.union(current.index)
+        old = previous.reindex(isins).fillna(0).to_numpy()
+        new = current.reindex(isins).fillna(0).to_numpy()
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price = np.where(new[:, 0] != 0, new[:, 1] / new[:, 0], np.nan)
+            old_price = np.where(old[:, 0] != 0, old[:, 1] / old[:, 0], 0.0)
+        price = np.where(np.isnan(price), old_price, price)
+
+        traded = (new[:, 0] - old[:, 0]) * price
+        return float(traded[traded > 0].sum()), float(abs(traded[traded < 0].sum()))
+
+    def average_holding_months(self) -> float:
+        """Mean length of all completed holding spells"""
+        spells = self._completed_durations.sum()
+        if not spells:
+            return None
+        return float(
+            (
+                np.arange(len(self._completed_durations)) * self._completed_durations
+            ).sum()
+            / spells
+        )
+
+    def holding_periods(self) -> Dict[str, int]:
+        """Months each currently held ISIN has been in the portfolio"""
+        current = len(self.months) - 1
+        return (current - self._spell_starts + 1).astype(int).to_dict()
+
+    def survival_curve(self) -> Dict[int, float]:
+        """Kaplan-Meier probability that a holding survives beyond n months.
+
+        Completed spells are events; spells still open are censored at their
+        current length.
+        """
+        open_lengths = np.bincount(
+            np.asarray(list(self.holding_periods().values()), dtype=int),
+            minlength=len(self._completed_durations),
+        )
+        events = np.pad(
+            self._completed_durations,
+            (0, len(open_lengths) - len(self._completed_durations)),
+        )
+        ended = events + open_lengths
+        at_risk = ended[::-1].cumsum()[::-1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hazard = np.where(at_risk > 0, events / at_risk, 0.0)
+        survival = np.cumprod(1 - hazard)
+        return {
+            int(months): float(survival[months]) for months in range(1, len(survival))
+        }